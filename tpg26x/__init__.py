@@ -1,4 +1,6 @@
 from .tpg26x import (
+    ContinuousInterval,
     Mnemonics,
+    PressureUnit,
     Tpg26x,
 )
@@ -0,0 +1,70 @@
+import argparse
+import sys
+import time
+import typing as t
+
+from .tpg26x import (
+    PressureUnit,
+    Tpg26x,
+)
+
+
+_UNIT_LABELS = {
+    PressureUnit.MBAR: "mbar",
+    PressureUnit.TORR: "Torr",
+    PressureUnit.PASCAL: "Pa",
+}
+
+
+def _parse_args(argv: t.Optional[t.List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="tpg26x",
+        description="Read pressures of gauge 1 from a TPG26x.",
+    )
+    parser.add_argument("port", help="serial port, e.g. COM0 or /dev/ttyUSB0")
+    parser.add_argument("-b", "--baudrate", type=int, default=9600)
+    parser.add_argument(
+        "-i",
+        "--interval",
+        type=float,
+        default=1.0,
+        help="polling interval in seconds",
+    )
+    parser.add_argument(
+        "--low-latency",
+        action="store_true",
+        help="lower the latency timer of an FTDI adapter (Linux only)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> None:
+    args = _parse_args(argv)
+    tpg26x = Tpg26x(args.port, baudrate=args.baudrate)
+    if args.low_latency and not tpg26x.lower_latency_timer():
+        sys.stderr.write("Could not lower the latency timer of the adapter.\n")
+
+    try:
+        unit = _UNIT_LABELS[tpg26x.get_pressure_unit()]
+        line = "Time: {:.3f}, Status: {}, Pressure: {} " + unit + "\n"
+
+        # Bound once here so the loop body only touches local names.
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        sleep = time.sleep
+        now = time.monotonic
+        read = tpg26x.read_gauge1
+        interval = args.interval
+
+        start = now()
+        while True:
+            status, pressure = read()
+            # Status digits the library does not know are looked up as None.
+            name = "UNKNOWN" if status is None else status.name
+            write(line.format(now() - start, name, pressure))
+            flush()
+            sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tpg26x._close()
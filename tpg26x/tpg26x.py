@@ -1,5 +1,9 @@
+from contextlib import closing
 import enum
 from functools import cached_property
+import os
+import sys
+import time
 import typing as t
 
 from serial import Serial
@@ -128,6 +132,16 @@ class Mnemonics(bytes, enum.Enum):
     """Watchdog control"""
 
 
+# Raw values of the mnemonics used on hot paths, which skips the member
+# lookup and the ``.value`` descriptor on every call.
+_PR1 = Mnemonics.PR1.value
+_PR2 = Mnemonics.PR2.value
+_PRX = Mnemonics.PRX.value
+_TID = Mnemonics.TID.value
+_ERR = Mnemonics.ERR.value
+_UNI = Mnemonics.UNI.value
+
+
 class MeasurementStatus(int, enum.Enum):
 
     OK = 0
@@ -139,13 +153,13 @@ class MeasurementStatus(int, enum.Enum):
     IDENTIFICATION_ERROR = 6
 
 
-def _search_measurement_status(value: int) -> t.Optional[MeasurementStatus]:
-    for status in MeasurementStatus:
-        if status == value:
-            return status
-    return None
+_MEAS_STATUS_BY_VALUE = {m.value: m for m in MeasurementStatus}
+_Measurement = t.Tuple[MeasurementStatus, float]
 
 
+def _search_measurement_status(value: int) -> t.Optional[MeasurementStatus]:
+    return _MEAS_STATUS_BY_VALUE.get(value)
+
 
 class GaugeID(bytes, enum.Enum):
 
@@ -177,11 +191,11 @@ class GaugeID(bytes, enum.Enum):
     """No identifier"""
 
 
+_GAUGE_ID_BY_VALUE = {m.value: m for m in GaugeID}
+
+
 def _search_gauge_id(value: bytes) -> t.Optional[GaugeID]:
-    for gauge_id in GaugeID:
-        if gauge_id == value:
-            return gauge_id
-    return None
+    return _GAUGE_ID_BY_VALUE.get(value)
 
 
 class GaugeType(bytes, enum.Enum):
@@ -190,20 +204,32 @@ class GaugeType(bytes, enum.Enum):
     GAUGE2 = b"1"
 
 
+class ContinuousInterval(bytes, enum.Enum):
+
+    MS100 = b"0"
+    """100 milliseconds"""
+
+    S1 = b"1"
+    """1 second"""
+
+    MIN1 = b"2"
+    """1 minute"""
+
+
 class ErrorStatus(bytes, enum.Enum):
 
     NO_ERROR = b"0000"
-    ERROR = b"0000"
+    ERROR = b"1000"
     NO_HARDWARE = b"0100"
     INADMISSIBLE_PARAMETER = b"0010"
     SYNTAX_ERROR = b"0001"
 
 
+_ERROR_STATUS_BY_VALUE = {m.value: m for m in ErrorStatus}
+
+
 def _search_error_status(value: bytes) -> t.Optional[ErrorStatus]:
-    for status in ErrorStatus:
-        if status == value:
-            return status
-    return None
+    return _ERROR_STATUS_BY_VALUE.get(value)
 
 
 class ResetErrorStatus(bytes, enum.Enum):
@@ -222,11 +248,54 @@ class ResetErrorStatus(bytes, enum.Enum):
     GAUGE2_IDENTIFICATION_ERROR = b"12"
 
 
-def _search_reset_error_status(value: bytes) -> ResetErrorStatus:
-    for status in ResetErrorStatus:
-        if status == value:
-            return status
-    return None
+_RESET_ERROR_STATUS_BY_VALUE = {m.value: m for m in ResetErrorStatus}
+
+
+def _search_reset_error_status(value: bytes) -> t.Optional[ResetErrorStatus]:
+    return _RESET_ERROR_STATUS_BY_VALUE.get(value)
+
+
+class PressureUnit(bytes, enum.Enum):
+
+    MBAR = b"0"
+    """mbar / bar"""
+
+    TORR = b"1"
+    """Torr"""
+
+    PASCAL = b"2"
+    """Pascal"""
+
+
+_PRESSURE_UNIT_BY_VALUE = {m.value: m for m in PressureUnit}
+
+
+def _search_pressure_unit(value: bytes) -> t.Optional[PressureUnit]:
+    return _PRESSURE_UNIT_BY_VALUE.get(value)
+
+
+_POW10_OFFSET = 30
+_POW10 = tuple(10.0**e for e in range(-_POW10_OFFSET, 10))
+_POW10_SIZE = len(_POW10)
+
+
+_FTDI_LATENCY_TIMER = "/sys/bus/usb-serial/devices/{}/latency_timer"
+
+
+def _set_latency_timer(port: str, latency_ms: int) -> bool:
+    device = os.path.basename(os.path.realpath(port))
+    try:
+        with open(_FTDI_LATENCY_TIMER.format(device), "w") as f:
+            f.write(str(latency_ms))
+    except OSError:
+        return False
+    return True
+
+
+_ACK = b"\x06"
+_NACK = b"\x15"
+_ENQUIRY = b"\x05"
+_NEWLINE = b"\r\n"
 
 
 class Tpg26x:
@@ -234,20 +303,43 @@ class Tpg26x:
     END_OF_TEXT = b"\x03"
     CR = b"\x0D"
     LF = b"\x0A"
-    ENQUIRY = b"\x05"
-    ACK = b"\x06"
-    NACK = b"\x15"
+    ENQUIRY = _ENQUIRY
+    ACK = _ACK
+    NACK = _NACK
+
+    NEWLINE = _NEWLINE
+
+    _CMD_PLUS_ENQ = {
+        m: m + _NEWLINE + _ENQUIRY
+        for m in (_PR1, _PR2, _PRX, _TID, _ERR, _UNI)
+    }
+
+    # Input is considered settled once nothing arrives for this long, which
+    # is well above the fastest continuous-mode period of 100 ms. Draining
+    # gives up if the input has not settled within the timeout.
+    _DRAIN_QUIET_TIME = 0.3
+    _DRAIN_TIMEOUT = 3.0
 
-    NEWLINE = CR + LF
+    # None leaves a gauge unchanged, True turns it on and False off.
+    _ONOFF_SIG = {None: b"0", True: b"1", False: b"2"}
 
     def __init__(self, port: str, baudrate: int = 9600) -> None:
         self._serial = Serial(port=port, baudrate=baudrate)
+        if sys.platform == "win32":
+            self._serial.set_buffer_size(rx_size=4096)
 
         self._log_to = []
+        self._rx_buffer = bytearray()
+
+    def lower_latency_timer(self, latency_ms: int = 1) -> bool:
+        # FTDI USB-serial adapters hold received bytes for 16 ms by default,
+        # which dominates short exchanges. This changes a system-wide setting
+        # of the adapter and is only possible on Linux with write access to
+        # sysfs, so it is left to the caller and reports whether it worked.
+        return _set_latency_timer(self._serial.port, latency_ms)
 
     def _close(self) -> None:
         self._serial.close()
-        del self
 
     @classmethod
     def _format(cls, *args: bytes) -> bytes:
@@ -260,16 +352,49 @@ class Tpg26x:
         self._serial.write(self.ENQUIRY)
 
     def readline(self) -> bytes:
-        data = self._serial.readline()
-        if data[-2:] == self.NEWLINE:
-            return data[:-2]
-        raise IOError("Unrecognizable data was received: {}".format(data))
+        # Block only for the first byte, then take whatever has already
+        # arrived in one call. Bytes following the newline belong to the
+        # next reply and are kept for the next call.
+        buf = self._rx_buffer
+        index = buf.find(_NEWLINE)
+        while index < 0:
+            chunk = self._serial.read(1)
+            if not chunk:
+                data = bytes(buf)
+                buf.clear()
+                raise IOError(
+                    "Unrecognizable data was received: {}".format(data),
+                )
+            buf += chunk
+            num_waiting = self._serial.in_waiting
+            if num_waiting:
+                buf += self._serial.read(num_waiting)
+            index = buf.find(_NEWLINE)
+
+        data = bytes(buf[:index])
+        del buf[:index + 2]
+        return data
+
+    def _drain_input(self) -> None:
+        # Wait until the TPG26x stops sending, then discard everything
+        # received so far, including what is already in the buffer.
+        self._serial.flush()
+        deadline = time.monotonic() + self._DRAIN_TIMEOUT
+        while True:
+            time.sleep(self._DRAIN_QUIET_TIME)
+            if not self._serial.in_waiting:
+                break
+            self._serial.reset_input_buffer()
+            if time.monotonic() >= deadline:
+                self._rx_buffer.clear()
+                raise IOError("The TPG26x did not stop sending data.")
+        self._rx_buffer.clear()
 
-    @classmethod
-    def _handle_ack(cls, data: bytes, mnemonic: Mnemonics) -> None:
-        if data == cls.ACK:
+    @staticmethod
+    def _handle_ack(data: bytes, mnemonic: t.Union[Mnemonics, bytes]) -> None:
+        if data == _ACK:
             return
-        elif data == cls.NACK:
+        elif data == _NACK:
             mnemonic = mnemonic.decode()
             raise IOError(
                 "Mnemonic {} was forbiddened by the TPG26x.".format(mnemonic),
@@ -277,73 +402,131 @@ class Tpg26x:
         else:
             raise IOError("Unexpected data was received: {}".format(data))
 
-    def send_command(self, mnemonic: Mnemonics, *args: bytes) -> None:
-        self._write(mnemonic.value, *args)
+    def send_command(
+        self,
+        mnemonic: t.Union[Mnemonics, bytes],
+        *args: bytes,
+    ) -> None:
+        # Members of Mnemonics are bytes themselves, so both are accepted.
+        self._write(mnemonic, *args)
         ack = self.readline()
         self._handle_ack(ack, mnemonic)
 
     @staticmethod
     def _parse_pressure(raw: bytes) -> float:
-        # NOTE
-        #   check required
         mantissa, exponent = raw.split(b"E")
-        mantissa = float(mantissa)
         exponent = int(exponent)
-        return mantissa * 10**exponent
+        index = exponent + _POW10_OFFSET
+        if 0 <= index < _POW10_SIZE:
+            return float(mantissa) * _POW10[index]
+        return float(mantissa) * 10**exponent
 
     @staticmethod
     def _parse_measurement(raw: bytes) -> t.Tuple[MeasurementStatus, float]:
-        status, pressure = raw.split(b",")
+        fields = raw.split(b",")
+        if len(fields) != 2:
+            raise IOError("Unrecognizable data was received: {}".format(raw))
+        status, pressure = fields
         status = _search_measurement_status(int(status))
         pressure = Tpg26x._parse_pressure(pressure)
         return (status, pressure)
 
     @staticmethod
-    def _parse_measurements(raw: bytes) -> t.Tuple[MeasurementStatus, float, float]:
-        status, pressure1, pressure2 = raw.split(b",")
-        status = _search_measurement_status(int(status))
-        pressure1 = Tpg26x._parse_pressure(pressure1)
-        pressure2 = Tpg26x._parse_pressure(pressure2)
-        return (status, pressure1, pressure2)
+    def _parse_measurements(raw: bytes) -> t.Tuple[_Measurement, _Measurement]:
+        fields = raw.split(b",")
+        if len(fields) != 4:
+            raise IOError("Unrecognizable data was received: {}".format(raw))
+        status1, pressure1, status2, pressure2 = fields
+        return (
+            (
+                _search_measurement_status(int(status1)),
+                Tpg26x._parse_pressure(pressure1),
+            ),
+            (
+                _search_measurement_status(int(status2)),
+                Tpg26x._parse_pressure(pressure2),
+            ),
+        )
+
+    def _query(self, mnemonic: bytes) -> bytes:
+        # The command and the enquiry go out in one write so that the
+        # TPG26x can answer both without waiting on the host in between.
+        self._serial.write(self._CMD_PLUS_ENQ[mnemonic])
+        self._receive_pipelined_ack(mnemonic)
+        return self.readline()
+
+    def _receive_pipelined_ack(self, mnemonic: bytes) -> None:
+        ack = self.readline()
+        if ack != _ACK:
+            # The enquiry has already been sent with the command, so any
+            # answer to it must not be read as the reply to the next one.
+            self._drain_input()
+        self._handle_ack(ack, mnemonic)
 
-    def _read_gauge(self, mnemonic: Mnemonics) -> t.Tuple[MeasurementStatus, float]:
-        self.send_command(mnemonic)
-        self.enquiry()
-        data = self.readline()
+    def _read_gauge(self, mnemonic: bytes) -> t.Tuple[MeasurementStatus, float]:
+        data = self._query(mnemonic)
         return self._parse_measurement(data)
 
     def read_gauge1(self) -> t.Tuple[MeasurementStatus, float]:
-        return self._read_gauge(Mnemonics.PR1)
+        return self._read_gauge(_PR1)
 
     def read_gauge2(self) -> t.Tuple[MeasurementStatus, float]:
-        return self._read_gauge(Mnemonics.PR2)
+        return self._read_gauge(_PR2)
 
-    def read_both(self) -> None:
-        self.send_command(Mnemonics.PRX)
-        self.enquiry()
-        data = self.readline()
+    def read_both(self) -> t.Tuple[_Measurement, _Measurement]:
+        data = self._query(_PRX)
         return self._parse_measurements(data)
 
+    def _stream(
+        self,
+        interval: ContinuousInterval,
+    ) -> t.Iterator[t.Tuple[_Measurement, _Measurement]]:
+        self.send_command(Mnemonics.COM, interval)
+        self.enquiry()
+        try:
+            while True:
+                yield self._parse_measurements(self.readline())
+        finally:
+            # ETX resets the interface of the TPG26x, which ends the
+            # continuous output. A frame may still be in flight, so the
+            # input is drained only once it has gone quiet.
+            self._serial.write(self.END_OF_TEXT)
+            self._drain_input()
+
+    def stream_gauge1(
+        self,
+        interval: ContinuousInterval = ContinuousInterval.S1,
+    ) -> t.Iterator[_Measurement]:
+        with closing(self._stream(interval)) as stream:
+            for measurement1, _ in stream:
+                yield measurement1
+
+    def stream_gauge2(
+        self,
+        interval: ContinuousInterval = ContinuousInterval.S1,
+    ) -> t.Iterator[_Measurement]:
+        with closing(self._stream(interval)) as stream:
+            for _, measurement2 in stream:
+                yield measurement2
+
+    def stream_both(
+        self,
+        interval: ContinuousInterval = ContinuousInterval.S1,
+    ) -> t.Iterator[t.Tuple[_Measurement, _Measurement]]:
+        return self._stream(interval)
+
     def _turn_on_off(
         self,
         gauge1: t.Optional[bool] = None,
         gauge2: t.Optional[bool] = None,
     ) -> None:
-        if gauge1 is None:
-            signal1 = b"0"
-        elif gauge1:
-            signal1 = b"1"
-        else:
-            signal1 = b"2"
-        if gauge2 is None:
-            signal2 = b"0"
-        elif gauge2:
-            signal2 = b"1"
-        else:
-            signal2 = b"2"
+        signal1 = self._ONOFF_SIG[gauge1]
+        signal2 = self._ONOFF_SIG[gauge2]
 
-        self.send_command(Mnemonics.SEN, signal1, signal2)
-        self.enquiry()
+        self._serial.write(
+            b"SEN," + signal1 + b"," + signal2 + _NEWLINE + _ENQUIRY,
+        )
+        self._receive_pipelined_ack(Mnemonics.SEN)
         data = self.readline()
         status1, status2 = data.split(b",")
 
@@ -372,22 +555,20 @@ class Tpg26x:
         self._turn_off(False, False)
 
     def _get_gauge_ids(self) -> t.Tuple[GaugeID, GaugeID]:
-        self.send_command(Mnemonics.TID)
-        self.enquiry()
-        data = self.readline()
+        data = self._query(_TID)
         id_gauge1, id_gauge2 = map(_search_gauge_id, data.split(b","))
 
-        cls = type(self)
-        cls.id_gauge1.func = lambda _: id_gauge1
-        cls.id_gauge2.func = lambda _: id_gauge2
+        # Both IDs come from the same reply, so cache them together.
+        self.__dict__["id_gauge1"] = id_gauge1
+        self.__dict__["id_gauge2"] = id_gauge2
 
         return (id_gauge1, id_gauge2)
 
-    @property
+    @cached_property
     def id_gauge1(self) -> GaugeID:
         return self._get_gauge_ids()[0]
 
-    @property
+    @cached_property
     def id_gauge2(self) -> GaugeID:
         return self._get_gauge_ids()[1]
 
@@ -411,14 +592,19 @@ class Tpg26x:
             raise IOError("Measurement channel wasn't changed appropriately.")
 
     def get_error_status(self) -> ErrorStatus:
-        self.send_command(Mnemonics.ERR)
-        self.enquiry()
-        data = self.readline()
+        data = self._query(_ERR)
         status = _search_error_status(data)
         if status is not None:
             return status
         raise IOError("Unexpected binary was received: {}".format(data))
 
+    def get_pressure_unit(self) -> PressureUnit:
+        data = self._query(_UNI)
+        unit = _search_pressure_unit(data)
+        if unit is not None:
+            return unit
+        raise IOError("Unexpected binary was received: {}".format(data))
+
     def reset(self) -> t.List[ResetErrorStatus]:
         self.send_command(Mnemonics.RES, b"1")
         self.enquiry()